@@ -6,14 +6,25 @@ Author: Daniel Kearney, CTO Firmus
 Date: 2025-12-16
 """
 
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # Headless PNG export; no GUI backend needed
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Rectangle
 import numpy as np
 import seaborn as sns
 
 # Set professional style
 sns.set_style('whitegrid')
-plt.rcParams['figure.facecolor'] = 'white'
-plt.rcParams['font.size'] = 10
+matplotlib.rcParams['figure.facecolor'] = 'white'
+matplotlib.rcParams['font.size'] = 10
+
+# PNG export: 150 dpi with fast zlib compression (level 3 vs PIL's default 6)
+SAVE_KWARGS = dict(dpi=150, bbox_inches='tight', pil_kwargs={'compress_level': 3, 'optimize': False})
 
 # Temporal power data from TEMPORAL_POWER_ANALYSIS.md
 models_data = {
@@ -53,81 +64,105 @@ colors = {
     'Llama-4-Scout-17B': '#56B4E9'
 }
 
-def generate_power_trace(model_data, duration=10, sample_rate=100):
-    time = np.linspace(0, duration, duration * sample_rate)
-    power = np.zeros_like(time)
-    ramp_mask = time < 1.0
-    power[ramp_mask] = 200 + model_data['ramp_rate'] * time[ramp_mask]
-    prefill_mask = (time >= 1.0) & (time < 2.0)
-    power[prefill_mask] = model_data['prefill_peak']
-    decode_mask = (time >= 2.0) & (time < 8.0)
-    np.random.seed(42)
-    variance = np.random.normal(0, model_data['steady_std'], len(time[decode_mask]))
-    power[decode_mask] = model_data['steady_avg'] + variance
-    fall_mask = time >= 8.0
-    fall_time = time[fall_mask] - 8.0
-    power[fall_mask] = np.maximum(model_data['steady_avg'] + model_data['fall_rate'] * fall_time, 200)
-    return time, power
-
-# Individual subplots
-fig, axes = plt.subplots(3, 2, figsize=(16, 12))
-axes = axes.flatten()
-
-for idx, (model_name, model_data) in enumerate(models_data.items()):
-    ax = axes[idx]
-    time, power = generate_power_trace(model_data)
-    ax.plot(time, power, color=colors[model_name], linewidth=3.5, alpha=0.9)
-    ax.axvspan(0, 1, alpha=0.08, color='yellow')
-    ax.axvspan(1, 2, alpha=0.08, color='red')
-    ax.axvspan(2, 8, alpha=0.08, color='green')
-    ax.axvspan(8, 10, alpha=0.08, color='blue')
-    textstr = f'Peak: {model_data["prefill_peak"]:.0f}W\nAvg: {model_data["steady_avg"]:.0f}W\nCV: {model_data["cv"]:.4f}\nRamp: {model_data["ramp_rate"]:.0f} W/s'
-    ax.text(0.02, 0.98, textstr, transform=ax.transAxes, verticalalignment='top', 
-            bbox=dict(boxstyle='round', facecolor='white', alpha=0.8, edgecolor=colors[model_name], linewidth=2), 
-            fontsize=9, fontweight='bold')
-    ax.set_xlabel('Time (seconds)', fontweight='bold', fontsize=11)
-    ax.set_ylabel('Power (W)', fontweight='bold', fontsize=11)
-    ax.set_title(f'{model_name}', fontweight='bold', fontsize=13, color=colors[model_name], pad=10)
-    ax.grid(True, alpha=0.3, linestyle='--')
-    ax.set_xlim(0, 10)
-    ax.set_ylim(150, 900)
-    ax.axhline(y=model_data['steady_avg'], color=colors[model_name], linestyle='--', linewidth=2, alpha=0.4)
-
-plt.suptitle('Temporal Power Analysis - Individual Models (Enhanced Colors)', fontsize=16, fontweight='bold', y=0.995)
-plt.tight_layout()
-plt.savefig('temporal_power_traces_individual_ENHANCED.png', dpi=300, bbox_inches='tight')
-print("✅ Saved: temporal_power_traces_individual_ENHANCED.png")
-
-# Combined comparison
-fig2, ax2 = plt.subplots(figsize=(15, 9))
-for model_name, model_data in models_data.items():
-    time, power = generate_power_trace(model_data)
-    ax2.plot(time, power, color=colors[model_name], linewidth=3.5, label=model_name, alpha=0.9)
-
-ax2.set_xlabel('Time (seconds)', fontweight='bold', fontsize=13)
-ax2.set_ylabel('Power Consumption (W)', fontweight='bold', fontsize=13)
-ax2.set_title('Temporal Power Comparison - All Models\n(Colorblind-Friendly Palette)', fontweight='bold', fontsize=15, pad=15)
-ax2.grid(True, alpha=0.3, linestyle='--', linewidth=1)
-ax2.legend(loc='upper right', fontsize=11, framealpha=0.95, edgecolor='black', fancybox=True, shadow=True)
-ax2.set_xlim(0, 10)
-ax2.set_ylim(150, 900)
-
-phase_y = 870
-for x, label, color in [(0.5, 'Ramp', 'yellow'), (1.5, 'Prefill', 'red'), (5, 'Steady Decode', 'green'), (9, 'Fall-off', 'blue')]:
-    ax2.text(x, phase_y, label, fontsize=11, fontweight='bold', ha='center', bbox=dict(boxstyle='round', facecolor=color, alpha=0.3))
-
-plt.tight_layout()
-plt.savefig('temporal_power_comparison_all_models_ENHANCED.png', dpi=300, bbox_inches='tight')
-print("✅ Saved: temporal_power_comparison_all_models_ENHANCED.png")
-plt.show()
-
-print("\n" + "="*70)
-print("ENHANCED TEMPORAL POWER VISUALIZATION COMPLETE")
-print("="*70)
-print("\nColorblind-Friendly Palette:")
-for model, color in colors.items():
-    print(f"  • {model}: {color}")
-print("\nOutput Files:")
-print("  1. temporal_power_traces_individual_ENHANCED.png")
-print("  2. temporal_power_comparison_all_models_ENHANCED.png")
-print("="*70)
+# Shared time axis (10 s at 100 Hz) and phase boundaries: ramp < 1 s,
+# prefill < 2 s, steady decode < 8 s, fall-off afterwards
+TIME = np.linspace(0, 10, 1000)
+TIME.flags.writeable = False
+RAMP_END, PREFILL_END, DECODE_END = np.searchsorted(TIME, (1.0, 2.0, 8.0))
+
+def generate_power_trace(model_data):
+    power = np.empty_like(TIME, dtype=np.float32)
+    power[:RAMP_END] = 200 + model_data['ramp_rate'] * TIME[:RAMP_END]
+    power[RAMP_END:PREFILL_END] = model_data['prefill_peak']
+    rng = np.random.default_rng(42)
+    power[PREFILL_END:DECODE_END] = model_data['steady_avg'] + rng.normal(0, model_data['steady_std'], DECODE_END - PREFILL_END).astype(np.float32, copy=False)
+    power[DECODE_END:] = np.maximum(model_data['steady_avg'] + model_data['fall_rate'] * (TIME[DECODE_END:] - 8.0), 200)
+    return TIME, power
+
+# Stats box style; edgecolor is set per model
+BBOX_BASE = dict(boxstyle='round', facecolor='white', alpha=0.8, linewidth=2)
+
+# Phase background spans (start s, end s, color)
+PHASE_SPANS = [(0, 1, 'yellow'), (1, 2, 'red'), (2, 8, 'green'), (8, 10, 'blue')]
+
+def phase_background(ax):
+    """All phase spans as a single full-height collection for ``ax``."""
+    patches = [Rectangle((x0, 0), x1 - x0, 1, color=color, alpha=0.08) for x0, x1, color in PHASE_SPANS]
+    return PatchCollection(patches, match_original=True, transform=ax.get_xaxis_transform())
+
+def render_individual(traces):
+    """Individual subplots, one per model."""
+    fig = Figure(figsize=(16, 12), constrained_layout=True)
+    # All models share the same time/power ranges, so share the axes
+    axes = fig.subplots(3, 2, sharex=True, sharey=True)
+    axes = axes.flatten()
+    axes[0].set_xlim(0, 10)
+    axes[0].set_ylim(150, 900)
+    lines = [ax.plot([], [], linewidth=3.5, alpha=0.9)[0] for ax in axes]
+
+    for idx, (model_name, model_data) in enumerate(models_data.items()):
+        ax = axes[idx]
+        time, power = traces[model_name]
+        lines[idx].set_data(time, power)
+        lines[idx].set_color(colors[model_name])
+        ax.add_collection(phase_background(ax), autolim=False)
+        textstr = f'Peak: {model_data["prefill_peak"]:.0f}W\nAvg: {model_data["steady_avg"]:.0f}W\nCV: {model_data["cv"]:.4f}\nRamp: {model_data["ramp_rate"]:.0f} W/s'
+        ax.text(0.02, 0.98, textstr, transform=ax.transAxes, verticalalignment='top', 
+                bbox={**BBOX_BASE, 'edgecolor': colors[model_name]}, 
+                fontsize=9, fontweight='bold')
+        ax.set_xlabel('Time (seconds)', fontweight='bold', fontsize=11)
+        ax.set_ylabel('Power (W)', fontweight='bold', fontsize=11)
+        ax.set_title(f'{model_name}', fontweight='bold', fontsize=13, color=colors[model_name], pad=10)
+        ax.grid(True, alpha=0.3, linestyle='--')
+        ax.label_outer()
+        ax.axhline(y=model_data['steady_avg'], color=colors[model_name], linestyle='--', linewidth=2, alpha=0.4)
+
+    fig.suptitle('Temporal Power Analysis - Individual Models (Enhanced Colors)', fontsize=16, fontweight='bold')
+    FigureCanvasAgg(fig).print_figure('temporal_power_traces_individual_ENHANCED.png', **SAVE_KWARGS)
+    print("✅ Saved: temporal_power_traces_individual_ENHANCED.png")
+
+def render_combined(traces):
+    """Combined comparison of all models on one axis."""
+    fig2 = Figure(figsize=(15, 9), constrained_layout=True)
+    ax2 = fig2.subplots()
+    # All traces share the time axis: draw them as one collection, with
+    # proxy lines for the legend
+    segments = [np.column_stack(traces[model_name]) for model_name in models_data]
+    ax2.add_collection(LineCollection(segments, colors=[colors[model_name] for model_name in models_data], linewidths=3.5, alpha=0.9))
+    handles = [Line2D([], [], color=colors[model_name], linewidth=3.5, alpha=0.9, label=model_name) for model_name in models_data]
+
+    ax2.set_xlabel('Time (seconds)', fontweight='bold', fontsize=13)
+    ax2.set_ylabel('Power Consumption (W)', fontweight='bold', fontsize=13)
+    ax2.set_title('Temporal Power Comparison - All Models\n(Colorblind-Friendly Palette)', fontweight='bold', fontsize=15, pad=15)
+    ax2.grid(True, alpha=0.3, linestyle='--', linewidth=1)
+    ax2.legend(handles=handles, loc='upper right', fontsize=11, framealpha=0.95, edgecolor='black', fancybox=True, shadow=True)
+    ax2.set_xlim(0, 10)
+    ax2.set_ylim(150, 900)
+
+    phase_y = 870
+    for x, label, color in [(0.5, 'Ramp', 'yellow'), (1.5, 'Prefill', 'red'), (5, 'Steady Decode', 'green'), (9, 'Fall-off', 'blue')]:
+        ax2.text(x, phase_y, label, fontsize=11, fontweight='bold', ha='center', bbox=dict(boxstyle='round', facecolor=color, alpha=0.3))
+
+    FigureCanvasAgg(fig2).print_figure('temporal_power_comparison_all_models_ENHANCED.png', **SAVE_KWARGS)
+    print("✅ Saved: temporal_power_comparison_all_models_ENHANCED.png")
+
+if __name__ == '__main__':
+    # Traces are deterministic, so generate once and reuse for both figures
+    traces = {model_name: generate_power_trace(model_data) for model_name, model_data in models_data.items()}
+
+    # The two figures are independent; render them in separate processes
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(render, traces) for render in (render_individual, render_combined)]
+        for future in futures:
+            future.result()
+
+    print("\n" + "="*70)
+    print("ENHANCED TEMPORAL POWER VISUALIZATION COMPLETE")
+    print("="*70)
+    print("\nColorblind-Friendly Palette:")
+    for model, color in colors.items():
+        print(f"  • {model}: {color}")
+    print("\nOutput Files:")
+    print("  1. temporal_power_traces_individual_ENHANCED.png")
+    print("  2. temporal_power_comparison_all_models_ENHANCED.png")
+    print("="*70)
@@ -5,11 +5,14 @@ This script creates .ipynb files in the notebooks/ directory
 based on the code examples provided in notebooks/README.md.
 
 Usage:
-    python scripts/generate_notebooks.py
+    python scripts/generate_notebooks.py [--force]
+
+Existing notebooks are left alone; pass --force to overwrite any that differ
+from the template.
 """
 
+import argparse
 import json
-import os
 from pathlib import Path
 
 
@@ -37,6 +40,19 @@ NOTEBOOK_TEMPLATES = {
 }
 
 
+NOTEBOOK_METADATA = {
+    "kernelspec": {
+        "display_name": "Python 3",
+        "language": "python",
+        "name": "python3"
+    },
+    "language_info": {
+        "name": "python",
+        "version": "3.10.0"
+    }
+}
+
+
 def create_notebook(name: str, title: str, description: str) -> dict:
     """Create a basic Jupyter notebook structure."""
     return {
@@ -54,24 +70,18 @@ def create_notebook(name: str, title: str, description: str) -> dict:
                 "source": ["# Add your code here"]
             }
         ],
-        "metadata": {
-            "kernelspec": {
-                "display_name": "Python 3",
-                "language": "python",
-                "name": "python3"
-            },
-            "language_info": {
-                "name": "python",
-                "version": "3.10.0"
-            }
-        },
+        "metadata": NOTEBOOK_METADATA,
         "nbformat": 4,
         "nbformat_minor": 4
     }
 
 
-def main():
-    """Generate notebook files."""
+def main(force: bool = False):
+    """Generate notebook files.
+    
+    Args:
+        force: Overwrite existing notebooks that differ from the template
+    """
     # Get notebooks directory
     notebooks_dir = Path(__file__).parent.parent / "notebooks"
     notebooks_dir.mkdir(exist_ok=True)
@@ -81,19 +91,26 @@ def main():
     for name, info in NOTEBOOK_TEMPLATES.items():
         notebook_path = notebooks_dir / f"{name}.ipynb"
         
-        if notebook_path.exists():
-            print(f"  Skipping {name}.ipynb (already exists)")
-            continue
-        
         notebook = create_notebook(name, info["title"], info["description"])
+        expected = json.dumps(notebook, indent=2).encode()
         
-        with open(notebook_path, 'w') as f:
-            json.dump(notebook, f, indent=2)
+        # Existing notebooks may hold user edits; only overwrite with --force
+        exists = notebook_path.exists()
+        if exists and notebook_path.read_bytes() == expected:
+            print(f"  Skipping {name}.ipynb (up to date)")
+            continue
+        if exists and not force:
+            print(f"  Skipping {name}.ipynb (already exists, use --force to overwrite)")
+            continue
         
-        print(f"  Created {name}.ipynb")
+        notebook_path.write_bytes(expected)
+        print(f"  {'Updated' if exists else 'Created'} {name}.ipynb")
     
     print("\nDone! See notebooks/README.md for code examples to add.")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true",
+                        help="overwrite existing notebooks that differ from the template")
+    main(force=parser.parse_args().force)
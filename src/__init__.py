@@ -6,12 +6,28 @@ Utility modules for model evaluation on H200 infrastructure.
 __version__ = "0.1.0"
 __author__ = "Firmus AI Team"
 
-# Import key utilities for easier access
-try:
-    from .model_loader import ModelLoader
-    from .metrics import PerformanceMetrics, QualityMetrics
-    from .infrastructure import GPUMonitor, ResourceTracker
-    from .cost_calculator import CostAnalyzer
-except ImportError:
-    # Modules not yet created, will be available after implementation
-    pass
+import importlib
+
+# Key utilities, imported lazily on first attribute access (PEP 562) so that
+# `import src` does not pull in torch/transformers/pynvml
+_LAZY_IMPORTS = {
+    "ModelLoader": ".model_loader",
+    "PerformanceMetrics": ".metrics",
+    "QualityMetrics": ".metrics",
+    "GPUMonitor": ".infrastructure",
+    "ResourceTracker": ".infrastructure",
+    "CostAnalyzer": ".cost_calculator",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        try:
+            module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        except ImportError as e:
+            # Modules not yet created, will be available after implementation
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from e
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,11 +3,38 @@
 Pure analysis functions that operate on collected power samples and timestamps.
 """
 
-import statistics
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Iterable, List, Tuple, Optional
+from dataclasses import dataclass, fields
+from functools import lru_cache
 import json
 
+import numpy as np
+
+# np.trapz was renamed to np.trapezoid in NumPy 2.0 (and later removed)
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+@lru_cache(maxsize=None)
+def _jit_trapz_kernel():
+    """numba-compiled trapezoid kernel, or None if numba is not installed.
+    
+    numba is imported on first use rather than at module load, since it
+    adds noticeable import time for callers that never batch-integrate.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    
+    @njit(cache=True, fastmath=True)
+    def _trapz_energy(power, ts):
+        total = 0.0
+        for i in range(power.size - 1):
+            total += 0.5 * (power[i] + power[i + 1]) * (ts[i + 1] - ts[i])
+        return total
+    
+    return _trapz_energy
+
 
 @dataclass
 class EnergyMetrics:
@@ -27,26 +54,57 @@ class EnergyMetrics:
     power_variance_cv: float
     model_name: Optional[str] = None
     run_id: Optional[str] = None
+    gpu_temp_celsius: Optional[float] = None
+    thermal_throttled: bool = False
+    power_throttled: bool = False
     
     def to_dict(self) -> dict:
-        return {k: v for k, v in self.__dict__.items()}
+        return {name: getattr(self, name) for name in _ENERGY_METRICS_FIELDS}
     
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), indent=2)
 
 
+_ENERGY_METRICS_FIELDS = tuple(f.name for f in fields(EnergyMetrics))
+
+
 def calculate_energy(power_samples: List[float], timestamps: List[float]) -> float:
     """Calculate total energy using trapezoidal integration."""
     if len(power_samples) < 2:
         return 0.0
     
-    total_energy_j = 0.0
-    for i in range(len(power_samples) - 1):
-        dt = timestamps[i+1] - timestamps[i]
-        avg_power = (power_samples[i] + power_samples[i+1]) / 2
-        total_energy_j += avg_power * dt
+    power = np.asarray(power_samples, dtype=np.float64)
+    ts = np.asarray(timestamps, dtype=np.float64)
+    return float(_trapezoid(power, ts))
+
+
+def calculate_energy_batch(traces: Iterable[Tuple[List[float], List[float]]]) -> List[float]:
+    """Integrate many saved (power_samples, timestamps) traces.
+    
+    For post-processing benchmark suites. Uses a numba-compiled kernel when
+    numba is installed, which avoids NumPy dispatch overhead on repeated
+    small arrays; the first call pays the JIT compile.
+    """
+    kernel = _jit_trapz_kernel()
+    if kernel is None:
+        return [calculate_energy(power, ts) for power, ts in traces]
     
-    return total_energy_j
+    energies = []
+    for power_samples, timestamps in traces:
+        if len(power_samples) < 2:
+            energies.append(0.0)
+            continue
+        power = np.asarray(power_samples, dtype=np.float64)
+        ts = np.asarray(timestamps, dtype=np.float64)
+        energies.append(float(kernel(power, ts)))
+    return energies
+
+
+def power_statistics(power_samples: List[float]) -> Tuple[float, float, float]:
+    """Return (mean, peak, sample stdev) of power readings via NumPy reductions."""
+    arr = np.asarray(power_samples, dtype=np.float64)
+    power_stdev = float(arr.std(ddof=1)) if arr.size > 1 else 0.0
+    return float(arr.mean()), float(arr.max()), power_stdev
 
 
 def calculate_metrics(
@@ -76,9 +134,7 @@ def calculate_metrics(
     duration = timestamps[-1] - timestamps[0]
     
     # Power statistics
-    avg_power = statistics.mean(power_samples)
-    peak_power = max(power_samples)
-    power_stdev = statistics.stdev(power_samples) if len(power_samples) > 1 else 0.0
+    avg_power, peak_power, power_stdev = power_statistics(power_samples)
     power_cv = (power_stdev / avg_power) if avg_power > 1.0 else 0.0
     
     # Efficiency metrics
@@ -9,15 +9,22 @@ Provides comprehensive energy tracking for LLM inference with:
 - Model-to-Grid discount qualification system
 
 Optimized for NVIDIA H200 with 700W TDP and 25ms power sampling.
+
+Part of the src package; import it as src.energy_monitor and run the
+example below with: python -m src.energy_monitor
 """
 
 import pynvml
+import numpy as np
+import threading
 import time
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Optional
 from enum import Enum
 import json
-import statistics
+
+from .energy_analyzer import EnergyMetrics, calculate_energy, power_statistics
+from .power_sensor import NVML_FI_DEV_POWER_INSTANT, instant_power_mw, supports_instant_power
 
 
 class DiscountTier(Enum):
@@ -44,31 +51,6 @@ class QualificationResult:
         return result
 
 
-@dataclass
-class EnergyMetrics:
-    """Comprehensive energy metrics for model inference"""
-    total_energy_joules: float
-    tokens_generated: int
-    joules_per_token: float
-    tokens_per_joule: float  # Efficiency metric
-    avg_power_watts: float
-    peak_power_watts: float
-    duration_seconds: float
-    prefill_energy_joules: float
-    decode_energy_joules: float
-    wh_per_1k_queries: float  # Scalability metric
-    gpu_temp_celsius: Optional[float] = None
-    thermal_throttled: bool = False
-    power_throttled: bool = False
-    power_variance_cv: Optional[float] = None  # Coefficient of variation
-    
-    def to_dict(self) -> Dict:
-        return asdict(self)
-    
-    def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2)
-
-
 class H200EnergyMonitor:
     """
     NVIDIA H200 Energy Monitor with 25ms power sampling resolution.
@@ -80,13 +62,16 @@ class H200EnergyMonitor:
     Includes Model-to-Grid qualification system for pricing discounts.
     """
     
-    def __init__(self, gpu_index: int = 0, sampling_interval: float = 0.025):
+    def __init__(self, gpu_index: int = 0, sampling_interval: float = 0.025,
+                 expected_duration_seconds: float = 60.0):
         """
         Initialize energy monitor for specified GPU.
         
         Args:
             gpu_index: GPU device index (default: 0)
             sampling_interval: Power sampling interval in seconds (default: 25ms for H200)
+            expected_duration_seconds: Expected monitoring session length, used to
+                size the sample buffers up front (they grow if exceeded)
         """
         try:
             pynvml.nvmlInit()
@@ -98,51 +83,104 @@ class H200EnergyMonitor:
             gpu_name = pynvml.nvmlDeviceGetName(self.handle)
             print(f"Initialized energy monitoring for: {gpu_name}")
             
-            # Power sampling state
-            self.power_samples: List[float] = []
-            self.timestamps: List[float] = []
+            # Power sampling state: preallocated buffers, first n_samples valid
+            capacity = max(int(expected_duration_seconds / sampling_interval * 1.2), 2)
+            self._power_buf = np.empty(capacity, dtype=np.float32)  # analysis upcasts to float64
+            self._time_buf = np.empty(capacity, dtype=np.int64)  # perf_counter_ns()
+            self.n_samples = 0
             self.monitoring_active = False
+            self._sampler_thread: Optional[threading.Thread] = None
+            
+            # Prefer the instantaneous power field over the averaged reading
+            self._instant_power = supports_instant_power(self.handle)
             
         except pynvml.NVMLError as e:
             raise RuntimeError(f"Failed to initialize NVML: {e}")
     
-    def start_monitoring(self):
-        """Begin power sampling"""
-        self.power_samples = []
-        self.timestamps = []
+    def _read_power_mw(self) -> int:
+        """Read GPU power in milliwatts with a single NVML call"""
+        if self._instant_power:
+            field = pynvml.nvmlDeviceGetFieldValues(self.handle, [NVML_FI_DEV_POWER_INSTANT])[0]
+            power_mw = instant_power_mw(field)
+            if power_mw is not None:
+                return power_mw
+            # Field stopped being supported; use the averaged reading from now on
+            self._instant_power = False
+        return pynvml.nvmlDeviceGetPowerUsage(self.handle)
+    
+    def start_monitoring(self, background: bool = False):
+        """
+        Begin power sampling.
+        
+        Args:
+            background: Sample on a daemon thread every sampling_interval until
+                stop_monitoring(), instead of relying on the caller to invoke
+                sample_power() from its own loop
+        
+        Raises:
+            RuntimeError: If a background sampler is already running
+        """
+        if self._sampler_thread is not None and self._sampler_thread.is_alive():
+            raise RuntimeError("Background sampling already running; call stop_monitoring() first")
+        self.n_samples = 0
         self.monitoring_active = True
-        self.start_time = time.time()
+        if background:
+            self._sampler_thread = threading.Thread(target=self._sampling_loop, daemon=True)
+            self._sampler_thread.start()
         print(f"Energy monitoring started (sampling every {self.sampling_interval*1000:.1f}ms)")
     
+    def _sampling_loop(self):
+        """Background sampler body; runs until monitoring is stopped"""
+        while self.monitoring_active:
+            self.sample_power()
+            time.sleep(self.sampling_interval)
+    
     def sample_power(self):
         """Sample current GPU power consumption"""
         if not self.monitoring_active:
             return
         
         try:
-            power_mw = pynvml.nvmlDeviceGetPowerUsage(self.handle)
-            power_w = power_mw / 1000.0
-            self.power_samples.append(power_w)
-            self.timestamps.append(time.time())
+            power_w = self._read_power_mw() / 1000.0
         except pynvml.NVMLError as e:
             print(f"Warning: Power sampling failed: {e}")
+            return
+        
+        n = self.n_samples
+        if n == self._power_buf.size:
+            # Grow geometrically; only the first n entries are meaningful
+            self._power_buf = np.resize(self._power_buf, 2 * n)
+            self._time_buf = np.resize(self._time_buf, 2 * n)
+        self._power_buf[n] = power_w
+        self._time_buf[n] = time.perf_counter_ns()
+        self.n_samples = n + 1
+    
+    @property
+    def power_samples(self) -> np.ndarray:
+        """Power readings (W) of the current session, as a view into the buffer"""
+        return self._power_buf[:self.n_samples]
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Sample times of the current session in seconds since the first sample"""
+        ts_ns = self._time_buf[:self.n_samples]
+        if ts_ns.size == 0:
+            return np.empty(0, dtype=np.float64)
+        # Monotonic integer nanoseconds; convert to seconds only at analysis time
+        return (ts_ns - ts_ns[0]) * 1e-9
     
     def stop_monitoring(self) -> float:
         """Stop monitoring and return total energy consumed"""
         self.monitoring_active = False
-        self.end_time = time.time()
+        if self._sampler_thread is not None:
+            self._sampler_thread.join()
+            self._sampler_thread = None
         
         if len(self.power_samples) < 2:
             raise ValueError("Insufficient power samples for energy calculation")
         
         # Trapezoidal integration for energy calculation
-        total_energy_j = 0.0
-        for i in range(len(self.power_samples) - 1):
-            dt = self.timestamps[i+1] - self.timestamps[i]
-            avg_power = (self.power_samples[i] + self.power_samples[i+1]) / 2
-            total_energy_j += avg_power * dt
-        
-        return total_energy_j
+        return calculate_energy(self.power_samples, self.timestamps)
     
     def calculate_metrics(self, tokens_generated: int, prefill_tokens: int = 0) -> EnergyMetrics:
         """
@@ -156,13 +194,14 @@ class H200EnergyMonitor:
             EnergyMetrics object with normalized efficiency metrics
         """
         total_energy_j = self.stop_monitoring()
-        duration = self.end_time - self.start_time
+        # Durations come from the sample clock (perf_counter_ns) so the
+        # phase split below subtracts like from like
+        timestamps = self.timestamps
+        duration = float(timestamps[-1])
         
-        avg_power = statistics.mean(self.power_samples)
-        peak_power = max(self.power_samples)
+        avg_power, peak_power, power_stdev = power_statistics(self.power_samples)
         
         # Calculate coefficient of variation for power stability
-        power_stdev = statistics.stdev(self.power_samples) if len(self.power_samples) > 1 else 0.0
         power_cv = power_stdev / avg_power if avg_power > 0 else 0.0
         
         # Normalized metrics
@@ -174,10 +213,13 @@ class H200EnergyMonitor:
         
         # Phase attribution (if prefill count provided)
         prefill_energy = 0.0
+        prefill_duration = 0.0
         decode_energy = total_energy_j
         if prefill_tokens > 0 and len(self.power_samples) > prefill_tokens:
-            prefill_samples = self.power_samples[:prefill_tokens]
-            prefill_energy = sum(prefill_samples) * self.sampling_interval
+            prefill_energy = calculate_energy(
+                self.power_samples[:prefill_tokens], timestamps[:prefill_tokens]
+            )
+            prefill_duration = float(timestamps[prefill_tokens-1])
             decode_energy = total_energy_j - prefill_energy
         
         # Thermal monitoring
@@ -195,10 +237,12 @@ class H200EnergyMonitor:
             peak_power_watts=peak_power,
             duration_seconds=duration,
             prefill_energy_joules=prefill_energy,
+            prefill_duration_seconds=prefill_duration,
             decode_energy_joules=decode_energy,
+            decode_duration_seconds=duration - prefill_duration,
             wh_per_1k_queries=wh_per_1k_queries,
-            gpu_temp_celsius=temp,
-            power_variance_cv=power_cv
+            power_variance_cv=power_cv,
+            gpu_temp_celsius=temp
         )
     
     def qualify_for_discount(self, 
@@ -212,7 +256,7 @@ class H200EnergyMonitor:
         for pricing discounts while providing infrastructure predictability.
         
         Args:
-            num_samples: Number of inference samples to run (default: 20)
+            num_samples: Number of power samples to collect (default: 20)
             sample_tokens: Tokens per sample (default: 10)
         
         Returns:
@@ -220,18 +264,17 @@ class H200EnergyMonitor:
         """
         print(f"Starting Model-to-Grid qualification (running {num_samples} samples)...")
         
-        self.start_monitoring()
-        
-        # Simulate inference samples with power sampling
-        for i in range(num_samples):
-            self.sample_power()
+        # Sample in the background until enough readings are in; give up after
+        # 10x the nominal time if reads keep failing
+        self.start_monitoring(background=True)
+        target = max(num_samples, 2)
+        deadline = time.perf_counter() + 10 * target * self.sampling_interval
+        while self.n_samples < target and time.perf_counter() < deadline:
             time.sleep(self.sampling_interval)
         
         # Calculate power statistics
         total_energy_j = self.stop_monitoring()
-        avg_power = statistics.mean(self.power_samples)
-        peak_power = max(self.power_samples)
-        power_stdev = statistics.stdev(self.power_samples) if len(self.power_samples) > 1 else 0.0
+        avg_power, peak_power, power_stdev = power_statistics(self.power_samples)
         power_cv = power_stdev / avg_power if avg_power > 0 else 0.0
         
         # Determine tier and discount
@@ -5,17 +5,147 @@ architectures and power measurement devices. Supports NVIDIA (H200, B200,
 Grace-Hopper), AMD, and future hardware platforms.
 """
 
-from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from ctypes import byref, c_uint
+from dataclasses import dataclass, asdict
+from functools import cached_property, lru_cache
+from typing import Optional, Dict, Any, Final, NoReturn, Sequence, Tuple
+import atexit
+import inspect
 import logging
+import threading
+import time
+
+import numpy as np
+
+from .energy_analyzer import calculate_energy
+
+try:
+    import pynvml as _pynvml
+except ImportError:
+    _pynvml = None
 
 logger = logging.getLogger(__name__)
 
+# Instantaneous power field (mW); older pynvml releases lack the constant
+NVML_FI_DEV_POWER_INSTANT = getattr(_pynvml, "NVML_FI_DEV_POWER_INSTANT", 186)
+
+# NVML reports power in milliwatts
+_MW_TO_W: Final[float] = 0.001
+
+# Snapshots younger than this are reused by get_snapshot()
+_SNAPSHOT_TTL_S = 0.001
+
+# c_nvmlValue_t union member for each NVML_VALUE_TYPE_* code
+_FIELD_VALUE_ATTRS = ("dVal", "uiVal", "ulVal", "ullVal", "sllVal", "siVal", "usVal")
+
+
+# NVML stays initialized while any sensor holds a reference
+_nvml_refcount = 0
+_nvml_lock = threading.Lock()
+
+
+def _nvml_acquire() -> None:
+    """Take a reference on the shared NVML session, initializing it first."""
+    global _nvml_refcount
+    with _nvml_lock:
+        if _nvml_refcount == 0:
+            _pynvml.nvmlInit()
+        _nvml_refcount += 1
+
+
+def _nvml_release() -> None:
+    """Drop a reference on the shared NVML session, shutting it down last."""
+    global _nvml_refcount
+    with _nvml_lock:
+        _nvml_refcount -= 1
+        if _nvml_refcount == 0:
+            _pynvml.nvmlShutdown()
+
+
+def field_value(field):
+    """Extract the typed value from an NVML field-value result.
+    
+    Args:
+        field: c_nvmlFieldValue_t returned by nvmlDeviceGetFieldValues
+        
+    Returns:
+        The union member selected by the field's valueType
+    """
+    return getattr(field.value, _FIELD_VALUE_ATTRS[field.valueType])
+
+
+def instant_power_mw(field) -> Optional[int]:
+    """Decode an NVML_FI_DEV_POWER_INSTANT field result.
+    
+    Args:
+        field: c_nvmlFieldValue_t for NVML_FI_DEV_POWER_INSTANT
+        
+    Returns:
+        Power in milliwatts, or None if the device reports the field as
+        not supported (callers should fall back to nvmlDeviceGetPowerUsage)
+        
+    Raises:
+        pynvml.NVMLError: For any other field error
+    """
+    if field.nvmlReturn == _pynvml.NVML_SUCCESS:
+        return field_value(field)
+    if field.nvmlReturn != _pynvml.NVML_ERROR_NOT_SUPPORTED:
+        raise _pynvml.NVMLError(field.nvmlReturn)
+    return None
+
+
+def _raise_power_error(e: Exception) -> NoReturn:
+    """Translate a backend read error into the sensor-level RuntimeError."""
+    raise RuntimeError(f"Failed to read power: {e}") from e
+
+
+def _device_name(handle) -> str:
+    """Device name as str; older pynvml releases return bytes."""
+    name = _pynvml.nvmlDeviceGetName(handle)
+    return name.decode("ascii") if isinstance(name, bytes) else name
+
 
-class PowerSensor(ABC):
-    """Abstract base class for power monitoring sensors."""
+def supports_instant_power(handle) -> bool:
+    """Check whether a device reports NVML_FI_DEV_POWER_INSTANT.
+    
+    Args:
+        handle: NVML device handle
+        
+    Returns:
+        bool: True if the instantaneous power field can be read; False on
+        older drivers/pynvml releases or unsupported devices
+    """
+    try:
+        field = _pynvml.nvmlDeviceGetFieldValues(handle, [NVML_FI_DEV_POWER_INSTANT])[0]
+    except (_pynvml.NVMLError, AttributeError):
+        return False
+    return field.nvmlReturn == _pynvml.NVML_SUCCESS
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceInfo:
+    """Static description of a power-monitored device."""
+    name: str
+    type: str
+    index: Optional[int] = None
+    max_power_watts: Optional[float] = None
+    features: Tuple[str, ...] = ()
+    device_count: int = 1
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Dict form, matching the previous get_device_info() payload."""
+        return asdict(self)
+
+
+class PowerSensor:
+    """Base class for power monitoring sensors.
+    
+    A plain class rather than an ABC: subclasses must override every method
+    below, each of which raises NotImplementedError.
+    """
+    
+    __slots__ = ()
     
-    @abstractmethod
     def get_power_watts(self) -> float:
         """Get current power consumption in watts.
         
@@ -23,45 +153,65 @@ class PowerSensor(ABC):
             float: Current power draw in watts
             
         Raises:
-            RuntimeError: If power reading fails
+            RuntimeError: If the sensor is not initialized
+            Exception: Backend read errors propagate unwrapped (e.g.
+                pynvml.NVMLError for NVIDIA sensors)
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def get_temperature(self) -> Optional[float]:
         """Get current device temperature in Celsius.
         
         Returns:
             Optional[float]: Temperature in Celsius, or None if unavailable
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
-    def get_device_info(self) -> Dict[str, Any]:
+    def get_device_info(self) -> DeviceInfo:
         """Get device information.
         
         Returns:
-            Dict with keys: name, type, max_power_watts, features
+            DeviceInfo with name, type, max_power_watts, features
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def initialize(self) -> None:
         """Initialize the sensor hardware."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def shutdown(self) -> None:
         """Clean shutdown of sensor."""
-        pass
+        raise NotImplementedError
 
 
 class NvidiaPowerSensor(PowerSensor):
     """NVIDIA GPU power sensor using NVML.
     
     Supports H200, B200, Grace-Hopper, and other NVIDIA GPUs with NVML support.
+    
+    After a successful initialize(), get_power_watts, get_temperature and
+    get_device_info are rebound on the instance to unguarded fast paths;
+    shutdown() restores the guarded class methods.
     """
     
+    # Public method name -> unguarded implementation bound after initialize()
+    _FAST_PATHS = (
+        ("get_power_watts", "_get_power_watts_fast"),
+        ("get_temperature", "_get_temperature_fast"),
+        ("get_device_info", "_get_device_info_fast"),
+    )
+    
+    # Per-sample state lives in slots; __dict__ is kept for the rebound fast
+    # paths above and the cached _device_info
+    __slots__ = (
+        "gpu_index", "handle", "_initialized", "_shared", "_has_energy", "_use_instant",
+        "_snapshot", "_snapshot_time",
+        "_get_power", "_get_temperature", "_nvml_temp_gpu", "_get_utilization",
+        "_get_instant_field", "_fn_power", "_fn_temperature", "_fn_field_values",
+        "_field_array_t",
+        "__dict__",
+    )
+    
     def __init__(self, gpu_index: int = 0):
         """Initialize NVIDIA power sensor.
         
@@ -71,94 +221,469 @@ class NvidiaPowerSensor(PowerSensor):
         self.gpu_index = gpu_index
         self.handle = None
         self._initialized = False
+        self._shared = False
+        self._has_energy = False
+        self._snapshot: Optional[Tuple[float, float, float]] = None
+        self._snapshot_time = 0.0
     
     def initialize(self) -> None:
-        """Initialize NVML and get device handle."""
+        """Initialize NVML and get device handle.
+        
+        A no-op if the sensor is already initialized, so the NVML reference
+        is only taken once.
+        """
+        if self._initialized:
+            return
+        acquired = False
         try:
-            import pynvml
-            pynvml.nvmlInit()
-            self.handle = pynvml.nvmlDeviceGetHandleByIndex(self.gpu_index)
+            if _pynvml is None:
+                raise ImportError("pynvml is not installed")
+            _nvml_acquire()
+            acquired = True
+            self.handle = _pynvml.nvmlDeviceGetHandleByIndex(self.gpu_index)
+            
+            # Bind hot-path NVML functions once to skip module lookups per sample
+            self._get_power = _pynvml.nvmlDeviceGetPowerUsage
+            self._get_temperature = _pynvml.nvmlDeviceGetTemperature
+            self._nvml_temp_gpu = _pynvml.NVML_TEMPERATURE_GPU
+            self._get_utilization = _pynvml.nvmlDeviceGetUtilizationRates
+            self._get_instant_field = self._wrapped_instant_field
+            self._bind_raw_nvml()
+            
+            # nvmlDeviceGetPowerUsage is a 1 s average on Ampere and newer;
+            # prefer the instantaneous sensor reading where supported
+            self._use_instant = supports_instant_power(self.handle)
+            
+            # Hardware energy counter (Volta+), integrated on the GPU itself
+            try:
+                _pynvml.nvmlDeviceGetTotalEnergyConsumption(self.handle)
+                self._has_energy = True
+            except _pynvml.NVMLError:
+                self._has_energy = False
+            
+            # Device info is static, so query it once here
+            self._device_info
             self._initialized = True
             
-            device_info = self.get_device_info()
-            logger.info(f"Initialized NVIDIA power sensor: {device_info['name']}")
+            # Swap in guard-free hot paths now that the handle is valid
+            for name, fast in self._FAST_PATHS:
+                setattr(self, name, getattr(self, fast))
+            logger.info(f"Initialized NVIDIA power sensor: {self._device_info.name}")
         except Exception as e:
+            if acquired:
+                _nvml_release()
             raise RuntimeError(f"Failed to initialize NVIDIA sensor: {e}")
     
+    def _bind_raw_nvml(self) -> None:
+        """Call NVML's C entry points directly where pynvml exposes them.
+        
+        Skips pynvml's Python wrappers, which allocate an output struct and
+        translate the return code on every call. Each raw call allocates its
+        own output buffer, since a shared one would be overwritten by
+        concurrent readers (e.g. a PollingSampler alongside the caller); the
+        c_uint costs far less than the driver call itself.
+        
+        The pointers are plain ctypes foreign functions, so the GIL is
+        released for the duration of each driver call and a sampling thread
+        blocked in NVML does not stall Python work on other threads. A
+        compiled nogil wrapper would only add a build step.
+        """
+        get_pointer = (getattr(_pynvml, "_nvmlGetFunctionPointer", None)
+                       or getattr(getattr(_pynvml, "nvml", None), "_nvmlGetFunctionPointer", None))
+        if get_pointer is None:
+            return
+        try:
+            self._fn_power = get_pointer("nvmlDeviceGetPowerUsage")
+            self._fn_temperature = get_pointer("nvmlDeviceGetTemperature")
+        except _pynvml.NVMLError:
+            return
+        self._get_power = self._raw_power_usage
+        self._get_temperature = self._raw_temperature
+        
+        try:
+            self._fn_field_values = get_pointer("nvmlDeviceGetFieldValues")
+            self._field_array_t = _pynvml.c_nvmlFieldValue_t * 1
+        except (_pynvml.NVMLError, AttributeError):
+            return
+        self._get_instant_field = self._raw_instant_field
+    
+    def _raw_power_usage(self, handle) -> int:
+        out = c_uint()
+        ret = self._fn_power(handle, byref(out))
+        if ret != _pynvml.NVML_SUCCESS:
+            raise _pynvml.NVMLError(ret)
+        return out.value
+    
+    def _raw_temperature(self, handle, sensor: int) -> int:
+        out = c_uint()
+        ret = self._fn_temperature(handle, sensor, byref(out))
+        if ret != _pynvml.NVML_SUCCESS:
+            raise _pynvml.NVMLError(ret)
+        return out.value
+    
+    def _raw_instant_field(self, handle):
+        fields = self._field_array_t()
+        fields[0].fieldId = NVML_FI_DEV_POWER_INSTANT
+        ret = self._fn_field_values(handle, 1, fields)
+        if ret != _pynvml.NVML_SUCCESS:
+            raise _pynvml.NVMLError(ret)
+        return fields[0]
+    
+    def _wrapped_instant_field(self, handle):
+        return _pynvml.nvmlDeviceGetFieldValues(handle, [NVML_FI_DEV_POWER_INSTANT])[0]
+    
+    def _read_power_mw(self):
+        """Read power in milliwatts, instantaneous if available."""
+        if self._use_instant:
+            power_mw = instant_power_mw(self._get_instant_field(self.handle))
+            if power_mw is not None:
+                return power_mw
+            # Field stopped being supported; use the averaged reading from now on
+            self._use_instant = False
+        return self._get_power(self.handle)
+    
     def get_power_watts(self) -> float:
         """Get current GPU power consumption.
         
+        Uses the instantaneous NVML power field when the device supports it,
+        falling back to nvmlDeviceGetPowerUsage (1 s average on Ampere+).
+        
         Returns:
             float: Power consumption in watts
+            
+        Raises:
+            pynvml.NVMLError: If the NVML read fails (not wrapped, to keep
+                exception handling off the per-sample path)
         """
         if not self._initialized:
             raise RuntimeError("Sensor not initialized. Call initialize() first.")
+        return self._read_power_mw() * _MW_TO_W
+    
+    def _get_power_watts_fast(self) -> float:
+        """get_power_watts without the initialization check."""
+        return self._read_power_mw() * _MW_TO_W
+    
+    def get_snapshot(self) -> Tuple[float, float, float]:
+        """Get power, temperature and utilization together.
         
-        try:
-            import pynvml
-            power_mw = pynvml.nvmlDeviceGetPowerUsage(self.handle)
-            return power_mw / 1000.0
-        except Exception as e:
-            raise RuntimeError(f"Failed to read power: {e}")
+        Meant for monitoring paths that log all three per tick. Results are
+        reused for 1 ms, so colocated queries within that window share a
+        single set of NVML reads.
+        
+        Returns:
+            Tuple of (power in watts, temperature in Celsius, GPU utilization
+            in percent)
+            
+        Raises:
+            pynvml.NVMLError: If an NVML read fails
+        """
+        if not self._initialized:
+            raise RuntimeError("Sensor not initialized. Call initialize() first.")
+        
+        now = time.perf_counter()
+        if self._snapshot is not None and now - self._snapshot_time < _SNAPSHOT_TTL_S:
+            return self._snapshot
+        
+        self._snapshot = (
+            self._read_power_mw() * _MW_TO_W,
+            float(self._get_temperature(self.handle, self._nvml_temp_gpu)),
+            float(self._get_utilization(self.handle).gpu),
+        )
+        self._snapshot_time = now
+        return self._snapshot
+    
+    def sample_into(self, trace: "PowerTrace") -> None:
+        """Append one power reading, timestamped with perf_counter, to ``trace``.
+        
+        Raises:
+            pynvml.NVMLError: If the NVML read fails
+        """
+        trace.append(self.get_power_watts(), time.perf_counter())
+    
+    @property
+    def has_energy_counter(self) -> bool:
+        """Whether the device exposes a hardware total-energy counter."""
+        return self._has_energy
+    
+    def get_energy_joules(self) -> float:
+        """Get total energy consumed since the driver was loaded.
+        
+        Only differences between two readings are meaningful; see
+        EnergyInterval.
+        
+        Returns:
+            float: Energy counter value in joules
+            
+        Raises:
+            RuntimeError: If the device has no energy counter
+            pynvml.NVMLError: If the NVML read fails
+        """
+        if not self._initialized:
+            raise RuntimeError("Sensor not initialized. Call initialize() first.")
+        if not self._has_energy:
+            raise RuntimeError("Energy counter not supported on this device")
+        
+        return _pynvml.nvmlDeviceGetTotalEnergyConsumption(self.handle) / 1000.0
     
     def get_temperature(self) -> Optional[float]:
         """Get GPU temperature.
         
         Returns:
-            Optional[float]: Temperature in Celsius
+            Optional[float]: Temperature in Celsius, or None if not initialized
+            
+        Raises:
+            pynvml.NVMLError: If the NVML read fails
         """
         if not self._initialized:
             return None
-        
+        return float(self._get_temperature(self.handle, self._nvml_temp_gpu))
+    
+    def _get_temperature_fast(self) -> Optional[float]:
+        """get_temperature without the initialization check."""
+        return float(self._get_temperature(self.handle, self._nvml_temp_gpu))
+    
+    @cached_property
+    def _device_info(self) -> DeviceInfo:
+        """Static device description, cached until shutdown()."""
+        return self._query_device_info()
+    
+    def _query_device_info(self) -> DeviceInfo:
+        """Query NVML once for the static device description."""
+        # Get power limit (max TDP)
         try:
-            import pynvml
-            return float(pynvml.nvmlDeviceGetTemperature(
-                self.handle, pynvml.NVML_TEMPERATURE_GPU
-            ))
-        except Exception as e:
-            logger.warning(f"Failed to read temperature: {e}")
-            return None
+            max_power_w = _pynvml.nvmlDeviceGetPowerManagementLimit(self.handle) * _MW_TO_W
+        except _pynvml.NVMLError_NotSupported:
+            max_power_w = None
+        
+        return DeviceInfo(
+            name=_device_name(self.handle),
+            type="NVIDIA_GPU",
+            index=self.gpu_index,
+            max_power_watts=max_power_w,
+            features=("power", "temperature", "utilization")
+        )
     
-    def get_device_info(self) -> Dict[str, Any]:
+    def get_device_info(self) -> DeviceInfo:
         """Get NVIDIA GPU information.
         
         Returns:
-            Dict with device details
+            DeviceInfo built once during initialize()
         """
         if not self._initialized:
             raise RuntimeError("Sensor not initialized")
+        return self._device_info
+    
+    def _get_device_info_fast(self) -> DeviceInfo:
+        """get_device_info without the initialization check."""
+        return self._device_info
+    
+    def shutdown(self) -> None:
+        """Release this sensor's reference on the shared NVML session.
         
+        Ignored for sensors handed out by create_power_sensor(), which are
+        shut down at interpreter exit.
+        """
+        if self._shared:
+            logger.debug("Ignoring shutdown() of a shared NVIDIA sensor")
+        elif self._initialized:
+            # Drop the reference even if NVML's own shutdown then fails
+            self._initialized = False
+            for name, _ in self._FAST_PATHS:
+                self.__dict__.pop(name, None)
+            self.__dict__.pop("_device_info", None)
+            try:
+                _nvml_release()
+                logger.debug("NVIDIA sensor shutdown complete")
+            except _pynvml.NVMLError as e:
+                logger.warning(f"NVML shutdown failed: {e}")
+
+
+class MultiGpuPowerSensor(PowerSensor):
+    """Node-level sensor covering every NVIDIA GPU through one NVML session.
+    
+    Initializes NVML once and caches all device handles, so sampling N GPUs
+    does not need N sensors each with its own init/shutdown.
+    """
+    
+    # __dict__ is kept for the cached _device_info
+    __slots__ = (
+        "handles", "_initialized", "_shared", "_use_instant",
+        "_get_power", "_get_temperature", "_nvml_temp_gpu",
+        "__dict__",
+    )
+    
+    def __init__(self):
+        """Initialize multi-GPU power sensor."""
+        self.handles = ()
+        self._initialized = False
+        self._shared = False
+    
+    def initialize(self) -> None:
+        """Initialize NVML and get handles for all devices.
+        
+        A no-op if the sensor is already initialized.
+        """
+        if self._initialized:
+            return
+        acquired = False
         try:
-            import pynvml
-            name = pynvml.nvmlDeviceGetName(self.handle)
+            if _pynvml is None:
+                raise ImportError("pynvml is not installed")
+            _nvml_acquire()
+            acquired = True
+            self.handles = tuple(
+                _pynvml.nvmlDeviceGetHandleByIndex(i)
+                for i in range(_pynvml.nvmlDeviceGetCount())
+            )
+            self._get_power = _pynvml.nvmlDeviceGetPowerUsage
+            self._get_temperature = _pynvml.nvmlDeviceGetTemperature
+            self._nvml_temp_gpu = _pynvml.NVML_TEMPERATURE_GPU
+            self._use_instant = all(supports_instant_power(h) for h in self.handles)
+            # Node description is static, so query it once here
+            self._device_info
+            self._initialized = True
             
-            # Get power limit (max TDP)
-            try:
-                max_power_mw = pynvml.nvmlDeviceGetPowerManagementLimit(self.handle)
-                max_power_w = max_power_mw / 1000.0
-            except:
-                max_power_w = None
-            
-            return {
-                "name": name,
-                "type": "NVIDIA_GPU",
-                "index": self.gpu_index,
-                "max_power_watts": max_power_w,
-                "features": ["power", "temperature", "utilization"]
-            }
+            logger.info(f"Initialized multi-GPU power sensor: {len(self.handles)} devices")
         except Exception as e:
-            raise RuntimeError(f"Failed to get device info: {e}")
+            if acquired:
+                _nvml_release()
+            raise RuntimeError(f"Failed to initialize multi-GPU sensor: {e}")
+    
+    def get_all_power_watts(self) -> np.ndarray:
+        """Get current power consumption of every GPU.
+        
+        Returns:
+            np.ndarray: float32 array of per-device power in watts
+            
+        Raises:
+            pynvml.NVMLError: If an NVML read fails
+        """
+        if not self._initialized:
+            raise RuntimeError("Sensor not initialized. Call initialize() first.")
+        # Scale in float64, then narrow, so 360000 mW stores as exactly 360.0
+        return (self._read_all_power_mw() * _MW_TO_W).astype(np.float32)
+    
+    def _read_all_power_mw(self) -> np.ndarray:
+        """Per-device power in milliwatts as float64 (exact for integer mW)."""
+        out = np.empty(len(self.handles), dtype=np.float64)
+        if self._use_instant:
+            get_fields = _pynvml.nvmlDeviceGetFieldValues
+            fields = [NVML_FI_DEV_POWER_INSTANT]
+            for i, handle in enumerate(self.handles):
+                field = get_fields(handle, fields)[0]
+                if field.nvmlReturn != _pynvml.NVML_SUCCESS:
+                    raise _pynvml.NVMLError(field.nvmlReturn)
+                out[i] = field_value(field)
+        else:
+            get_power = self._get_power
+            for i, handle in enumerate(self.handles):
+                out[i] = get_power(handle)
+        return out
+    
+    def get_field_values(self, field_ids: Sequence[int]) -> np.ndarray:
+        """Snapshot several NVML fields on every GPU.
+        
+        Issues one nvmlDeviceGetFieldValues call per device for all requested
+        fields, rather than one call per metric.
+        
+        Args:
+            field_ids: NVML_FI_DEV_* field identifiers
+            
+        Returns:
+            np.ndarray: Array of shape (num_devices, len(field_ids)); fields a
+            device does not support are NaN
+            
+        Raises:
+            pynvml.NVMLError: If an NVML call fails
+        """
+        if not self._initialized:
+            raise RuntimeError("Sensor not initialized. Call initialize() first.")
+        
+        field_ids = list(field_ids)
+        out = np.full((len(self.handles), len(field_ids)), np.nan)
+        for i, handle in enumerate(self.handles):
+            for j, field in enumerate(_pynvml.nvmlDeviceGetFieldValues(handle, field_ids)):
+                if field.nvmlReturn == _pynvml.NVML_SUCCESS:
+                    out[i, j] = field_value(field)
+        return out
+    
+    def get_power_watts(self) -> float:
+        """Get total power consumption across all GPUs.
+        
+        Returns:
+            float: Summed power draw in watts
+        """
+        if not self._initialized:
+            raise RuntimeError("Sensor not initialized. Call initialize() first.")
+        return float(self._read_all_power_mw().sum()) * _MW_TO_W
+    
+    def get_temperature(self) -> Optional[float]:
+        """Get the hottest GPU temperature.
+        
+        Returns:
+            Optional[float]: Maximum temperature in Celsius across devices,
+            or None if not initialized
+            
+        Raises:
+            pynvml.NVMLError: If an NVML read fails
+        """
+        if not self._initialized or not self.handles:
+            return None
+        get_temperature = self._get_temperature
+        temp_gpu = self._nvml_temp_gpu
+        return float(max(get_temperature(h, temp_gpu) for h in self.handles))
+    
+    @cached_property
+    def _device_info(self) -> DeviceInfo:
+        """Static node description, cached until shutdown()."""
+        return self._query_device_info()
+    
+    def _query_device_info(self) -> DeviceInfo:
+        """Query NVML for the static node description."""
+        names = [_device_name(h) for h in self.handles]
+        try:
+            max_power_w = sum(
+                _pynvml.nvmlDeviceGetPowerManagementLimit(h) for h in self.handles
+            ) * _MW_TO_W
+        except _pynvml.NVMLError_NotSupported:
+            max_power_w = None
+        
+        return DeviceInfo(
+            name=f"{len(names)}x {names[0]}" if names else "No GPUs",
+            type="NVIDIA_GPU_NODE",
+            max_power_watts=max_power_w,
+            features=("power", "temperature"),
+            device_count=len(names)
+        )
+    
+    def get_device_info(self) -> DeviceInfo:
+        """Get node-level GPU information.
+        
+        Returns:
+            DeviceInfo built once during initialize(); max_power_watts is the
+            summed power limit
+        """
+        if not self._initialized:
+            raise RuntimeError("Sensor not initialized")
+        return self._device_info
     
     def shutdown(self) -> None:
-        """Shutdown NVML."""
-        if self._initialized:
+        """Release this sensor's reference on the shared NVML session.
+        
+        Ignored for sensors handed out by create_power_sensor(), which are
+        shut down at interpreter exit.
+        """
+        if self._shared:
+            logger.debug("Ignoring shutdown() of a shared multi-GPU sensor")
+        elif self._initialized:
+            self._initialized = False
+            self.handles = ()
+            self.__dict__.pop("_device_info", None)
             try:
-                import pynvml
-                pynvml.nvmlShutdown()
-                self._initialized = False
-                logger.debug("NVIDIA sensor shutdown complete")
-            except:
-                pass
+                _nvml_release()
+                logger.debug("Multi-GPU sensor shutdown complete")
+            except _pynvml.NVMLError as e:
+                logger.warning(f"NVML shutdown failed: {e}")
 
 
 class RackPowerSensor(PowerSensor):
@@ -167,6 +692,8 @@ class RackPowerSensor(PowerSensor):
     Placeholder for future integration with PDU/BMC-level power monitoring.
     """
     
+    __slots__ = ("rack_id", "endpoint", "_initialized", "_device_info")
+    
     def __init__(self, rack_id: str, endpoint: str):
         """Initialize rack power sensor.
         
@@ -177,6 +704,11 @@ class RackPowerSensor(PowerSensor):
         self.rack_id = rack_id
         self.endpoint = endpoint
         self._initialized = False
+        self._device_info = DeviceInfo(
+            name=f"Rack-{rack_id}",
+            type="RACK_PDU",
+            features=("power",)
+        )
     
     def initialize(self) -> None:
         """Initialize rack sensor connection."""
@@ -190,39 +722,289 @@ class RackPowerSensor(PowerSensor):
     def get_temperature(self) -> Optional[float]:
         return None
     
-    def get_device_info(self) -> Dict[str, Any]:
-        return {
-            "name": f"Rack-{self.rack_id}",
-            "type": "RACK_PDU",
-            "features": ["power"]
-        }
+    def get_device_info(self) -> DeviceInfo:
+        return self._device_info
     
     def shutdown(self) -> None:
         pass
 
 
+class PowerTrace:
+    """Fixed-capacity power trace stored in preallocated NumPy arrays.
+    
+    Holds power as float32 and timestamps as float64, so a long run costs
+    12 bytes per sample instead of a boxed Python float per value.
+    
+    Example:
+        >>> trace = PowerTrace(capacity=100_000)
+        >>> for _ in range(1000):
+        ...     sensor.sample_into(trace)
+        >>> trace.stats()["energy_joules"]
+    """
+    
+    def __init__(self, capacity: int):
+        """Initialize power trace.
+        
+        Args:
+            capacity: Maximum number of samples; append() raises IndexError
+                once it is reached
+        """
+        self.buf = np.empty(capacity, dtype=np.float32)
+        self.ts = np.empty(capacity, dtype=np.float64)
+        self.n = 0
+    
+    def append(self, p: float, t: float) -> None:
+        """Record power ``p`` in watts at timestamp ``t`` in seconds."""
+        i = self.n
+        self.buf[i] = p
+        self.ts[i] = t
+        self.n = i + 1
+    
+    @property
+    def power(self) -> np.ndarray:
+        """View of the recorded power samples in watts."""
+        return self.buf[:self.n]
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """View of the recorded timestamps in seconds."""
+        return self.ts[:self.n]
+    
+    def stats(self) -> Dict[str, float]:
+        """Summarize the trace.
+        
+        Returns:
+            Dict with min/max/avg power in watts and trapezoid-integrated
+            energy in joules
+            
+        Raises:
+            ValueError: If the trace is empty
+        """
+        if self.n == 0:
+            raise ValueError("PowerTrace is empty")
+        power = self.power
+        return {
+            "min_power_watts": float(power.min()),
+            "max_power_watts": float(power.max()),
+            "avg_power_watts": float(power.mean(dtype=np.float64)),
+            "energy_joules": calculate_energy(power, self.timestamps),
+        }
+
+
+class PollingSampler:
+    """Background power sampler writing into a preallocated ring buffer.
+    
+    The sampling thread stores (timestamp, power) pairs into a fixed
+    float64 array of shape (capacity, 2) rather than growing Python lists;
+    once full, the oldest samples are overwritten. pynvml calls go through
+    ctypes, which releases the GIL while inside the driver. snapshot() may
+    be called while sampling is running.
+    
+    Example:
+        >>> sampler = PollingSampler(sensor)
+        >>> sampler.start(interval=0.015)
+        >>> run_inference()
+        >>> sampler.stop()
+        >>> trace = sampler.snapshot()  # columns: perf_counter seconds, watts
+    """
+    
+    def __init__(self, sensor: PowerSensor, capacity: int = 65536):
+        """Initialize polling sampler.
+        
+        Args:
+            sensor: Initialized power sensor to poll
+            capacity: Ring buffer size in samples
+        """
+        self.sensor = sensor
+        self._buffer = np.empty((capacity, 2), dtype=np.float64)
+        self._count = 0
+        self._lock = threading.Lock()  # guards _buffer rows and _count
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[Exception] = None
+    
+    def start(self, interval: float = 0.025) -> None:
+        """Start sampling every ``interval`` seconds on a daemon thread."""
+        if self._running:
+            raise RuntimeError("Sampler already running")
+        self._count = 0
+        self._error = None
+        self._running = True
+        self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to exit.
+        
+        Raises:
+            RuntimeError: If a sensor read failed during the session
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            _raise_power_error(self._error)
+    
+    @property
+    def sample_count(self) -> int:
+        """Samples taken since start(), including any overwritten in the ring."""
+        return self._count
+    
+    def snapshot(self) -> np.ndarray:
+        """Return a copy of the buffered samples, oldest first.
+        
+        Returns:
+            np.ndarray: Array of shape (n, 2) with perf_counter timestamps in
+            seconds and power in watts
+        """
+        with self._lock:
+            count = self._count
+            capacity = len(self._buffer)
+            if count <= capacity:
+                return self._buffer[:count].copy()
+            start = count % capacity
+            return np.concatenate((self._buffer[start:], self._buffer[:start]))
+    
+    def _run(self, interval: float) -> None:
+        buffer = self._buffer
+        capacity = len(buffer)
+        lock = self._lock
+        read_power = self.sensor.get_power_watts
+        clock = time.perf_counter
+        sleep = time.sleep
+        # One try around the whole session; sensor reads themselves are unguarded
+        try:
+            while self._running:
+                t = clock()
+                power = read_power()
+                # Write the row under the lock so snapshot() never sees it half done
+                with lock:
+                    row = buffer[self._count % capacity]
+                    row[0] = t
+                    row[1] = power
+                    self._count += 1
+                sleep(interval)
+        except Exception as e:
+            self._error = e
+            self._running = False
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class EnergyInterval:
+    """Context manager measuring the energy a sensor reports over a block.
+    
+    Uses the hardware energy counter (two reads) when the sensor has one,
+    otherwise samples get_power_watts() with a PollingSampler and integrates
+    the trace. A failed read during the block is raised from __exit__.
+    
+    Example:
+        >>> with EnergyInterval(sensor) as interval:
+        ...     run_inference()
+        >>> interval.joules
+    """
+    
+    def __init__(self, sensor: PowerSensor, sampling_interval: float = 0.025,
+                 capacity: int = 65536):
+        """Initialize energy interval.
+        
+        Args:
+            sensor: Initialized power sensor
+            sampling_interval: Fallback power sampling interval in seconds
+            capacity: Fallback sampler ring buffer size; blocks longer than
+                capacity * sampling_interval lose their earliest samples
+        """
+        self.sensor = sensor
+        self.sampling_interval = sampling_interval
+        self.capacity = capacity
+        self.joules: Optional[float] = None
+        self._use_counter = getattr(sensor, "has_energy_counter", False)
+    
+    def __enter__(self):
+        self.joules = None
+        if self._use_counter:
+            self._start_joules = self.sensor.get_energy_joules()
+        else:
+            self._sampler = PollingSampler(self.sensor, self.capacity)
+            self._sampler.start(self.sampling_interval)
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._use_counter:
+            self.joules = self.sensor.get_energy_joules() - self._start_joules
+            return
+        
+        self._sampler.stop()
+        if self._sampler.sample_count > self.capacity:
+            logger.warning(f"EnergyInterval sampler overflowed; energy covers "
+                           f"only the last {self.capacity} samples")
+        # Close the trace with a reading taken at the end of the block
+        end = (time.perf_counter(), self.sensor.get_power_watts())
+        trace = np.vstack((self._sampler.snapshot(), end))
+        self.joules = calculate_energy(trace[:, 1], trace[:, 0])
+
+
+_SENSORS = {
+    "nvidia": NvidiaPowerSensor,
+    "nvidia_multi": MultiGpuPowerSensor,
+    "rack": RackPowerSensor,
+}
+
+
+# Placeholder backends whose initialize() is not implemented yet; the
+# factory returns them uninitialized
+_PLACEHOLDER_SENSORS = frozenset({"rack"})
+
+
+def _shutdown_shared(sensor: PowerSensor) -> None:
+    """Really shut down a factory-owned sensor (registered with atexit)."""
+    sensor._shared = False
+    sensor.shutdown()
+
+
+@lru_cache(maxsize=None)
+def _get_sensor(sensor_type: str, kwargs_frozen: frozenset) -> PowerSensor:
+    """Create, initialize and memoize one sensor per (type, kwargs)."""
+    sensor = _SENSORS[sensor_type](**dict(kwargs_frozen))
+    if sensor_type in _PLACEHOLDER_SENSORS:
+        return sensor
+    sensor.initialize()
+    sensor._shared = True
+    atexit.register(_shutdown_shared, sensor)
+    return sensor
+
+
 def create_power_sensor(sensor_type: str = "nvidia", **kwargs) -> PowerSensor:
-    """Factory function to create power sensors.
+    """Factory function to get an initialized power sensor.
+    
+    Sensors are shared: repeated calls with the same type and parameters
+    return the same initialized instance, so NVML is not re-initialized per
+    evaluation round. Shutdown happens automatically at interpreter exit;
+    calling initialize() or shutdown() on a shared sensor is a no-op.
+    Placeholder backends ("rack") are returned uninitialized.
     
     Args:
-        sensor_type: Type of sensor ("nvidia", "rack")
-        **kwargs: Sensor-specific parameters
+        sensor_type: Type of sensor ("nvidia", "nvidia_multi", "rack")
+        **kwargs: Sensor-specific parameters (must be hashable)
         
     Returns:
-        PowerSensor instance
+        Initialized PowerSensor instance
         
     Example:
         >>> sensor = create_power_sensor("nvidia", gpu_index=0)
-        >>> sensor.initialize()
         >>> power = sensor.get_power_watts()
     """
-    sensors = {
-        "nvidia": NvidiaPowerSensor,
-        "rack": RackPowerSensor,
-    }
-    
-    if sensor_type not in sensors:
+    if sensor_type not in _SENSORS:
         raise ValueError(f"Unknown sensor type: {sensor_type}. "
-                       f"Available: {list(sensors.keys())}")
+                       f"Available: {list(_SENSORS.keys())}")
     
-    return sensors[sensor_type](**kwargs)
+    # Key on the full argument set so gpu_index=0 and the default share a sensor
+    bound = inspect.signature(_SENSORS[sensor_type]).bind(**kwargs)
+    bound.apply_defaults()
+    return _get_sensor(sensor_type, frozenset(bound.arguments.items()))